@@ -22,6 +22,8 @@
 
 from .game import Game, FixedGame, TerminalGame
 from .solver import Solver
+from .shared import SharedWords, SharedWordTable
 from .utils import benchmark, solve
-from .wordtable import WordTable
+from .tracelog import TraceLog, TraceRecorder, replay
+from .wordtable import WordTable, Vocabulary
 from .dictionary import get_words
@@ -1,6 +1,9 @@
+import sys
+
 from .dictionary import get_words
 from .solver import MarkSolver
 from .utils import solve
 
 
-solve(get_words(), MarkSolver)
+# usage: python3.10 -m wordpy [word length]
+solve(get_words(int(sys.argv[1]) if len(sys.argv) > 1 else 5), MarkSolver)
@@ -0,0 +1,110 @@
+""" Persistent cache of dictionaries and solver precomputations.
+
+Cached word lists are stored as JSON files in `$WORDPY_CACHE_DIR`, or `wordpy-cache` in the temporary directory.
+Each entry is keyed by a fingerprint of its source, so changing the dictionary or bumping a solver version never loads stale data.
+
+Solver precomputations are stored only for dictionaries that loaded by `get_words`.
+Other tables, like test tables, synthetic dictionaries and samples, are never written to the disk.
+"""
+
+from typing import Callable, Iterable, TYPE_CHECKING
+import hashlib
+import json
+import os
+import weakref
+
+if TYPE_CHECKING:
+    from .wordtable import WordTable, Vocabulary
+
+
+# bump this when the format of cache files changes.
+CACHE_VERSION = 1
+
+# vocabularies of dictionaries that loaded by get_words.
+_dictionaries: 'weakref.WeakSet[Vocabulary]' = weakref.WeakSet()
+
+
+def register(words: 'WordTable') -> 'WordTable':
+    """ Mark the table as a dictionary, so precomputations of it are stored on disk. """
+
+    if words.vocabulary is not None:
+        _dictionaries.add(words.vocabulary)
+    return words
+
+
+def is_registered(words: 'WordTable') -> bool:
+    """ Check if words are all words of a registered dictionary, in any order.
+    Subsets of dictionaries are not stored, because there are too many of them.
+    """
+
+    return (
+        words.vocabulary is not None
+        and words.vocabulary in _dictionaries
+        and len(words) == len(words.vocabulary)
+    )
+
+
+def cache_dir() -> str:
+    if 'WORDPY_CACHE_DIR' in os.environ:
+        return os.environ['WORDPY_CACHE_DIR']
+
+    import tempfile
+    return os.path.join(tempfile.gettempdir(), 'wordpy-cache')
+
+
+def fingerprint(words: Iterable[str]) -> str:
+    """ Make a stable fingerprint of a word list.
+
+    >>> fingerprint(["hello", "world"])
+    '4a1e67f2fe1d1cc7'
+    """
+
+    h = hashlib.sha256()
+    for w in words:
+        h.update(w.encode('utf-8') + b'\n')
+    return h.hexdigest()[:16]
+
+
+def path_of(name: str, key: str) -> str:
+    return os.path.join(cache_dir(), f'{name}-v{CACHE_VERSION}-{key}.json')
+
+
+def load(name: str, key: str) -> list[str] | None:
+    try:
+        with open(path_of(name, key), 'r') as f:
+            words = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(words, list) or not all(isinstance(w, str) for w in words):
+        return None
+    return words
+
+
+def store(name: str, key: str, words: Iterable[str]) -> None:
+    path = path_of(name, key)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, 'w') as f:
+            json.dump(list(words), f)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def cached(name: str, key: str, compute: Callable[[], Iterable[str]], check: Callable[[list[str]], bool] | None = None) -> list[str]:
+    """ Load a word list from the cache, or compute and store it if not cached yet.
+    If check is given, loaded words that do not pass it are computed again.
+    """
+
+    words = load(name, key)
+    if words is not None and check is not None and not check(words):
+        words = None
+    if words is None:
+        words = list(compute())
+        store(name, key, words)
+    return words
@@ -1,21 +1,27 @@
 from typing import Iterable
-import tempfile
-import urllib.request
+import os
 
-from .wordtable import WordTable
+from . import cache
+from .wordtable import WordTable, Vocabulary
 
 
 DICTIONARY_URL = 'https://raw.githubusercontent.com/dwyl/english-words/master/words_alpha.txt'
 
 
+def dictionary_path() -> str:
+    import tempfile
+    return tempfile.gettempdir() + '/wordpy-dictionary.txt'
+
+
 def fetch() -> Iterable[str]:
-    fname = tempfile.gettempdir() + '/wordpy-dictionary.txt'
+    fname = dictionary_path()
     try:
         with open(fname, 'r') as f:
             return [l.strip('\n') for l in f]
     except:
         pass
 
+    import urllib.request
     with urllib.request.urlopen(DICTIONARY_URL) as f:
         result = [l.strip('\n') for l in f.read().decode('utf-8').splitlines()]
 
@@ -27,5 +33,19 @@ def fetch() -> Iterable[str]:
 
 def get_words(length: int = 5) -> WordTable:
     """ Get words dictionary from https://github.com/dwyl/english-words
+
+    Words of each length are cached, and reused until the downloaded dictionary changes.
+    Solver precomputations of the returned table are also stored in the cache.
     """
-    return WordTable(word for word in fetch() if len(word) == length)
+
+    try:
+        st = os.stat(dictionary_path())
+    except OSError:
+        fetch()
+        st = os.stat(dictionary_path())
+
+    return cache.register(Vocabulary(cache.cached(
+        f'words{length}',
+        f'{st.st_size}-{st.st_mtime_ns}',
+        lambda: (word for word in fetch() if len(word) == length),
+    )).table())
@@ -6,6 +6,22 @@ import itertools
 from .wordtable import WordTable
 
 
+def feedback(word: str, answer: str) -> str:
+    """ Get the feedback of trying the word, as a pattern string.
+    "g" is a correct letter, "y" is a letter that included in the answer at another position, and "." is a wrong letter.
+
+    >>> feedback("world", "hello")
+    '.y.g.'
+    >>> feedback("hello", "hello")
+    'ggggg'
+    """
+
+    return ''.join(
+        'g' if w == a else 'y' if w in answer else '.'
+        for w, a in zip(word, answer)
+    )
+
+
 @dataclass(frozen=True)
 class GameState:
     # letters that determined.
@@ -176,12 +192,25 @@ class TerminalGame(Game):
         )
 
     def ask_result(self) -> tuple[str, str]:
-        return input('what was correct? (input incorrect character as .)\n  _____\n> '), input('what characters was yellow?\n> ')
+        guide = '_' * self.answer_length
+        return input(f'what was correct? (input incorrect character as .)\n  {guide}\n> '), input('what characters was yellow?\n> ')
 
     def submit(self, word: str) -> bool:
-        result = self.ask_result()
-        correct = result[0]
-        includes = set(result[1])
+        return self.apply_result(word, *self.ask_result())
+
+    def apply_result(self, word: str, correct: str, yellow: str) -> bool:
+        """ Update the state using the result of the word, without asking it.
+
+        >>> game = TerminalGame(WordTable(["hello", "world"]))
+        >>> game.apply_result("world", "...l.", "o")
+        False
+        >>> game.state.found
+        '...l.'
+        >>> sorted(game.state.includes)
+        ['l', 'o']
+        """
+
+        includes = set(yellow)
 
         wrongs = self.state.wrongs
         if correct != word:
@@ -0,0 +1,163 @@
+""" Micro-benchmark of WordTable and solver hot paths
+
+Measures the speed of each operation on fixed dictionaries of several sizes.
+Results can be saved as a JSON baseline, and compared with later runs to find regressions.
+
+$ python3.10 -m wordpy.microbench --save baseline.json
+$ python3.10 -m wordpy.microbench --compare baseline.json
+"""
+
+from typing import Callable, Iterable
+import argparse
+import json
+import platform
+import random
+import string
+import sys
+import timeit
+
+from .game import FixedGame
+from .solver import Solver, RandomSolver, MajorLetterSolver, MinorLetterSolver, MarkSolver, LookaheadSolver
+from .wordtable import WordTable, Vocabulary
+
+
+SIZES = (1000, 10000, 50000)
+SOLVERS: tuple[type[Solver], ...] = (RandomSolver, MajorLetterSolver, MinorLetterSolver, MarkSolver, LookaheadSolver)
+
+
+def make_words(size: int, length: int = 5, seed: int = 0) -> WordTable:
+    """ Make a fixed dictionary of random words.
+    The same arguments always make the same dictionary.
+
+    >>> make_words(3)
+    WordTable(['vtkgn', 'kuhmp', 'xnhtq'])
+    """
+
+    rand = random.Random(seed)
+    words: dict[str, None] = {}
+    while len(words) < size:
+        words[''.join(rand.choices(string.ascii_lowercase, k=length))] = None
+    return Vocabulary(words).table()
+
+
+def played_game(words: WordTable, num_tries: int = 2) -> FixedGame:
+    """ Make a game that already tried some words. """
+
+    game = FixedGame(words, words[len(words) // 2])
+    for i in range(num_tries):
+        game.submit(words[i])
+    return game
+
+
+def cases(words: WordTable) -> Iterable[tuple[str, Callable[[], object]]]:
+    """ Make benchmark cases for the dictionary, as pairs of name and function. """
+
+    game = played_game(words)
+    state = game.state
+
+    yield 'WordTable.take_matches', lambda: words.take_matches(state.found, state.includes)
+    yield 'WordTable.drop_wrong', lambda: words.drop_wrong(state.wrongs[-1])
+    yield 'WordTable.drop_by_letters', lambda: words.drop_by_letters(state.not_includes)
+    yield 'WordTable.__getitem__[int]', lambda: words[len(words) // 2]
+    yield 'WordTable.__getitem__[slice]', lambda: words[len(words) // 4:len(words) // 2]
+
+    # tables cache their hash, bitmap and id set, so operators are measured on new tables including slicing them.
+    yield 'WordTable.__or__', lambda: words[::2] | words[len(words) // 4:]
+    yield 'WordTable.__and__', lambda: words[::2] & words[len(words) // 4:]
+    yield 'WordTable.__sub__', lambda: words[::2] - words[len(words) // 4:]
+    yield 'WordTable.__xor__', lambda: words[::2] ^ words[len(words) // 4:]
+    yield 'WordTable.__hash__', lambda: hash(words[::1])
+
+    def submit():
+        FixedGame(words, words[-1]).submit(words[0])
+
+    yield 'FixedGame.submit', submit
+    yield 'GameState.not_includes', lambda: state.not_includes
+
+    for cls in SOLVERS:
+        yield f'{cls.__name__}.guess', lambda cls=cls: cls(game).guess()
+
+
+def measure(func: Callable[[], object], repeat: int = 5, min_time: float = 0.2) -> float:
+    """ Measure seconds per call of func, as the best of repeats. """
+
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run(sizes: Iterable[int] = SIZES, pattern: str = '', repeat: int = 5) -> dict[str, float]:
+    results: dict[str, float] = {}
+
+    for size in sizes:
+        words = make_words(size)
+        for name, func in cases(words):
+            key = f'{name}[{size}]'
+            if pattern not in key:
+                continue
+            random.seed(0)
+            results[key] = measure(func, repeat=repeat)
+            print(f'{key:40s} {results[key]*1e6:12.2f} us', flush=True)
+
+    return results
+
+
+def save(path: str, results: dict[str, float]) -> None:
+    with open(path, 'w') as f:
+        json.dump({
+            'python': sys.version,
+            'platform': platform.platform(),
+            'results': results,
+        }, f, indent=2)
+
+
+def compare(path: str, results: dict[str, float], threshold: float = 0.1) -> list[str]:
+    """ Compare results with a saved baseline, and get names of cases that slower than threshold. """
+
+    with open(path, 'r') as f:
+        baseline = json.load(f)['results']
+
+    regressions: list[str] = []
+    for key, t in results.items():
+        if key not in baseline:
+            print(f'{key:40s} {t*1e6:12.2f} us  (new)')
+            continue
+
+        ratio = t / baseline[key] - 1
+        mark = ''
+        if ratio > threshold:
+            mark = '  REGRESSION'
+            regressions.append(key)
+        print(f'{key:40s} {baseline[key]*1e6:12.2f} us -> {t*1e6:12.2f} us  {ratio:+7.1%}{mark}')
+
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog='python -m wordpy.microbench', description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help='dictionary sizes to benchmark')
+    parser.add_argument('--filter', default='', help='run only cases that include this string in the name')
+    parser.add_argument('--repeat', type=int, default=5, help='number of repeats of each measurement')
+    parser.add_argument('--save', metavar='PATH', help='save results as a baseline')
+    parser.add_argument('--compare', metavar='PATH', help='compare results with a baseline')
+    parser.add_argument('--threshold', type=float, default=0.1, help='ratio of slowdown to report as regression')
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.filter, args.repeat)
+
+    if args.save:
+        save(args.save, results)
+
+    if args.compare:
+        print()
+        regressions = compare(args.compare, results, args.threshold)
+        if len(regressions) > 0:
+            print(f'{len(regressions)} regressions over {args.threshold:.0%}')
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,148 @@
+""" Chunked parallel execution of filter and score kernels.
+
+A kernel is a top-level function that takes a list of words and some arguments, and returns a list of results for the words.
+`ChunkExecutor` splits words into chunks, runs the kernel for each chunk on a pool of workers, and merges the results in the original order.
+
+>>> with ChunkExecutor(workers=2, chunk_size=2, threshold=0, processes=False) as executor:
+...     executor.map(filter_state, ["hello", "world", "heart", "hover"], "h....", {"h"}, None, "")
+['hello', 'heart', 'hover']
+
+Parallel solvers guess the same words as serial ones, in both processes and threads.
+
+>>> from wordpy.microbench import make_words, played_game
+>>> from wordpy.solver import MarkSolver
+>>> words = make_words(3000)
+>>> game = played_game(words)
+>>> expected = list(MarkSolver(game).guess())
+>>> for processes in (True, False):
+...     solver = MarkSolver.parallel(2, chunk_size=500, threshold=1000, processes=processes)
+...     with solver.executor:
+...         list(solver(played_game(words)).guess()) == expected
+True
+True
+"""
+
+from typing import Any, Callable, Sequence, Set, TypeVar, TYPE_CHECKING
+import itertools
+import os
+import sys
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+
+R = TypeVar('R')
+
+
+def gil_enabled() -> bool:
+    return getattr(sys, '_is_gil_enabled', lambda: True)()
+
+
+class ChunkExecutor:
+    """ Run kernels over chunks of words.
+
+    workers is the number of workers, or the number of CPUs if None.
+    Words are split into chunks of chunk_size words, and run serially if there are less than threshold words.
+
+    Pure Python kernels hold the GIL, so threads only help on free-threaded builds of Python.
+    On other builds processes are used by default, and chunks are sent to them by pickling.
+    """
+
+    def __init__(self, workers: int | None = None, chunk_size: int = 8192, threshold: int = 50_000, processes: bool | None = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.threshold = threshold
+        self.processes = gil_enabled() if processes is None else processes
+        self.__pool: 'Executor | None' = None
+
+    def should_split(self, size: int) -> bool:
+        return self.workers > 1 and size >= self.threshold and size > self.chunk_size
+
+    @property
+    def pool(self) -> 'Executor':
+        # imported here, because concurrent.futures and multiprocessing are slow to import.
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        if self.__pool is None:
+            if self.processes:
+                self.__pool = ProcessPoolExecutor(self.workers)
+            else:
+                self.__pool = ThreadPoolExecutor(self.workers, thread_name_prefix='wordpy-chunk')
+        return self.__pool
+
+    def map_chunks(self, kernel: Callable[..., R], words: Sequence[str], *args: Any) -> list[R]:
+        """ Run the kernel for each chunk, and get the result of each chunk in order. """
+
+        if not self.should_split(len(words)):
+            return [kernel(words, *args)]
+
+        words = list(words)
+        chunks = [words[i:i + self.chunk_size] for i in range(0, len(words), self.chunk_size)]
+        return list(self.pool.map(kernel, chunks, *(itertools.repeat(a, len(chunks)) for a in args)))
+
+    def map(self, kernel: Callable[..., list[R]], words: Sequence[str], *args: Any) -> list[R]:
+        """ Run the kernel for each chunk, and concatenate the results in order. """
+
+        return list(itertools.chain.from_iterable(self.map_chunks(kernel, words, *args)))
+
+    def close(self) -> None:
+        if self.__pool is not None:
+            self.__pool.shutdown()
+            self.__pool = None
+
+    def __enter__(self) -> 'ChunkExecutor':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __getstate__(self) -> dict:
+        # pools can not be sent to other processes. they make their own pool when needed.
+        state = self.__dict__.copy()
+        state['_ChunkExecutor__pool'] = None
+        return state
+
+
+def filter_state(words: Sequence[str], found: str, includes: Set[str], wrong: str | None, not_includes: str) -> list[str]:
+    """ Take words that can be the answer, in one pass.
+    This is the same as `Solver.drop_words_by_state`.
+    """
+
+    return [
+        word
+        for word in words
+        if all(p == '.' or w == p for p, w in zip(found, word))
+        and all(i in word for i in includes)
+        and (wrong is None or (
+            all(p == '.' or w != p for w, p in zip(word, wrong))
+            and all(l not in word for l in not_includes)
+        ))
+    ]
+
+
+def letter_score(word: str, ranking: list[list[str]]) -> int:
+    """ Score of a word by the ranking of letters at each position. Used by MajorLetterSolver. """
+
+    return sum(
+        26 - idx
+        for i, (w, idx) in enumerate((w, ranking[i].index(w)) for i, w in enumerate(word))
+        if idx >= 0 and w not in word[:i]
+    )
+
+
+def letter_scores(words: Sequence[str], ranking: list[list[str]]) -> list[int]:
+    return [letter_score(w, ranking) for w in words]
+
+
+def mark_score(word: str, tried: Set[str], positional_candidates: list[Set[str]], found: str, float_chars: Set[str]) -> int:
+    """ Score of a word as the next mark. Used by MarkSolver. """
+
+    return (
+        100 * sum(t not in word for t in tried) # try to use untried letter first.
+        + 10000 * sum(w in cs or found[i] != '.' for i, (cs, w) in enumerate(zip(positional_candidates, word))) # prefer to use candidate letters.
+        + sum(i in word for i in float_chars) # prefer to use candidate float letters.
+    )
+
+
+def mark_scores(words: Sequence[str], tried: Set[str], positional_candidates: list[Set[str]], found: str, float_chars: Set[str]) -> list[int]:
+    return [mark_score(w, tried, positional_candidates, found, float_chars) for w in words]
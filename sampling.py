@@ -0,0 +1,82 @@
+from dataclasses import dataclass
+from typing import Sequence
+import math
+import random
+
+
+# z-score of the 95% confidence interval.
+Z_95 = 1.96
+
+
+@dataclass(frozen=True)
+class SampleReport:
+    # number of words that sampled from.
+    population: int
+
+    # number of words that used for scoring.
+    sample_size: int
+
+    # estimated error of letter frequencies and other proportions, at 95% confidence.
+    error: float
+
+    @property
+    def exact(self) -> bool:
+        return self.sample_size >= self.population
+
+    def __str__(self) -> str:
+        if self.exact:
+            return f'exact ({self.population} words)'
+        return f'sampled {self.sample_size} of {self.population} words (error ±{self.error:.1%})'
+
+
+def sample_size(population: int, tolerance: float) -> int:
+    """ Get the sample size to estimate proportions within the tolerance, at 95% confidence.
+
+    >>> sample_size(100000, 0.01)
+    8763
+    >>> sample_size(100, 0.01)
+    99
+    """
+
+    n0 = Z_95 ** 2 * 0.25 / tolerance ** 2
+    return min(population, math.ceil(n0 / (1 + (n0 - 1) / population)))
+
+
+def margin_of_error(population: int, size: int) -> float:
+    """ Get the worst-case error of proportions that estimated from the sample, at 95% confidence.
+
+    >>> round(margin_of_error(100000, 8763), 4)
+    0.01
+    >>> margin_of_error(100, 100)
+    0.0
+    """
+
+    if size >= population:
+        return 0.0
+    return Z_95 * math.sqrt(0.25 / size * (population - size) / (population - 1))
+
+
+def stratified_sample(words: Sequence[str], size: int, rand: random.Random) -> list[str]:
+    """ Sample words keeping the ratio of the first letters.
+    Every first letter is sampled at least once, and the order of the words is kept.
+
+    >>> words = ["apple", "alpha", "angle", "bacon", "bread", "cream"]
+    >>> stratified_sample(words, 4, random.Random(0))
+    ['alpha', 'angle', 'bacon', 'cream']
+    """
+
+    strata: dict[str, list[int]] = {}
+    for i, w in enumerate(words):
+        strata.setdefault(w[:1], []).append(i)
+
+    # allocate the size to strata by the largest remainder method.
+    quotas = [size * len(indices) / len(words) for indices in strata.values()]
+    counts = [math.floor(q) for q in quotas]
+    for i in sorted(range(len(quotas)), key=lambda i: counts[i] - quotas[i])[:size - sum(counts)]:
+        counts[i] += 1
+
+    picked: list[int] = []
+    for indices, k in zip(strata.values(), counts):
+        picked.extend(rand.sample(indices, min(max(k, 1), len(indices))))
+
+    return [words[i] for i in sorted(picked)]
@@ -0,0 +1,194 @@
+""" Scalability benchmark across word lengths and dictionary sizes
+
+Runs every WordTable filter, and construction and the first guess() of every solver, on real dictionaries of each word length,
+and on synthetic dictionaries of 10k, 100k and 1M words.
+Solvers are measured with empty caches, so their precomputations are included.
+Time and peak memory are reported as curves, with the empirical exponent of the growth between sizes.
+
+$ python3.10 -m wordpy.scaling
+$ python3.10 -m wordpy.scaling --lengths 5 --sizes 10000 100000 --save scaling.json
+"""
+
+from typing import Callable, Iterable
+import argparse
+import gc
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from . import cache
+from .dictionary import get_words
+from .microbench import make_words, played_game
+from .solver import Solver, RandomSolver, MajorLetterSolver, MinorLetterSolver, MarkSolver, LookaheadSolver
+from .wordtable import WordTable, Vocabulary
+
+
+LENGTHS = range(4, 11)
+SIZES = (10_000, 100_000, 1_000_000)
+
+
+class FixedDepthLookaheadSolver(LookaheadSolver):
+    """ LookaheadSolver that always finishes its search, so its time shows the complexity instead of the time budget.
+    The search is shallow, because deeper searches take minutes on the largest dictionaries.
+    """
+
+    time_budget = math.inf
+    max_depth = 1
+    width = 10
+
+
+SOLVERS: tuple[type[Solver], ...] = (RandomSolver, MajorLetterSolver, MinorLetterSolver, MarkSolver, FixedDepthLookaheadSolver)
+
+# a point of a curve: (dictionary name, number of words, seconds, peak bytes)
+Point = tuple[str, int, float, int]
+
+
+def synthetic_words(size: int, length: int = 5) -> WordTable:
+    """ Get a synthetic dictionary.
+    It is generated once and stored in the cache, so generating it is not included in measurements.
+    """
+
+    return Vocabulary(cache.cached(
+        f'synthetic{length}',
+        f'{size}',
+        lambda: make_words(size, length),
+    )).table()
+
+
+def dictionaries(lengths: Iterable[int], sizes: Iterable[int]) -> Iterable[tuple[str, WordTable]]:
+    for length in lengths:
+        try:
+            words = get_words(length)
+        except OSError as e:
+            print(f'skip length {length}: {e}', file=sys.stderr)
+            continue
+        if len(words) > 2:
+            yield f'length {length}', words
+
+    for size in sizes:
+        yield f'synthetic {size}', synthetic_words(size)
+
+
+def cases(words: WordTable, cache_root: str) -> Iterable[tuple[str, Callable[[], Callable[[], object]]]]:
+    """ Make cases for the dictionary, as pairs of name and setup function that returns the function to measure.
+    Each setup of solvers clears their caches, and uses a new cache directory in cache_root.
+    """
+
+    state = played_game(words).state
+
+    yield 'WordTable.take_matches', lambda: lambda: words.take_matches(state.found, state.includes)
+    yield 'WordTable.drop_wrong', lambda: lambda: words.drop_wrong(state.wrongs[-1])
+    yield 'WordTable.drop_by_letters', lambda: lambda: words.drop_by_letters(state.not_includes)
+
+    def solver_setup(cls: type[Solver]) -> Callable[[], object]:
+        game = played_game(words)
+        cls.clear_cache()
+        os.environ['WORDPY_CACHE_DIR'] = tempfile.mkdtemp(dir=cache_root)
+        return lambda: cls(game).guess()
+
+    for cls in SOLVERS:
+        yield f'{cls.__name__}.first_guess', lambda cls=cls: solver_setup(cls)
+
+
+def measure(setup: Callable[[], Callable[[], object]], memory: bool = True, repeat: int = 3) -> tuple[float, int]:
+    """ Measure seconds and peak bytes of allocation of a call.
+    Time is the best of repeats, each after a new setup.
+    Memory is measured in a separate call, because tracing allocations slows down the call.
+    """
+
+    elapsed = math.inf
+    for _ in range(repeat):
+        func = setup()
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    peak = 0
+    if memory:
+        func = setup()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return elapsed, peak
+
+
+def exponent(a: Point, b: Point) -> float:
+    """ Get the empirical exponent of growth between 2 points, as t ∝ n^k. """
+
+    if a[1] == b[1] or a[2] <= 0 or b[2] <= 0:
+        return math.nan
+    return math.log(b[2] / a[2]) / math.log(b[1] / a[1])
+
+
+def run(lengths: Iterable[int] = LENGTHS, sizes: Iterable[int] = SIZES, pattern: str = '', memory: bool = True, repeat: int = 3) -> dict[str, list[Point]]:
+    curves: dict[str, list[Point]] = {}
+
+    # load dictionaries before replacing the cache directory, so they are not generated again.
+    loaded = list(dictionaries(lengths, sizes))
+
+    original = os.environ.get('WORDPY_CACHE_DIR')
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, words in loaded:
+                for case, setup in cases(words, tmp):
+                    if pattern not in case:
+                        continue
+                    elapsed, peak = measure(setup, memory, repeat)
+                    curves.setdefault(case, []).append((name, len(words), elapsed, peak))
+                    print(f'{case:30s} {name:18s} {len(words):9d} words {elapsed*1000:12.2f} ms {peak/1024:12.1f} KiB', flush=True)
+    finally:
+        if original is None:
+            os.environ.pop('WORDPY_CACHE_DIR', None)
+        else:
+            os.environ['WORDPY_CACHE_DIR'] = original
+
+    return curves
+
+
+def report(curves: dict[str, list[Point]]) -> None:
+    for case, points in curves.items():
+        print()
+        print(case)
+        synthetic = [p for p in points if p[0].startswith('synthetic')]
+        for p in points:
+            k = ''
+            if p in synthetic and synthetic.index(p) > 0:
+                k = f'  n^{exponent(synthetic[synthetic.index(p) - 1], p):.2f}'
+            print(f'  {p[0]:18s} {p[1]:9d} words {p[2]*1000:12.2f} ms {p[3]/1024:12.1f} KiB{k}')
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog='python -m wordpy.scaling', description=__doc__.splitlines()[0])
+    parser.add_argument('--lengths', type=int, nargs='*', default=LENGTHS, help='word lengths of real dictionaries')
+    parser.add_argument('--sizes', type=int, nargs='*', default=SIZES, help='sizes of synthetic dictionaries')
+    parser.add_argument('--filter', default='', help='run only cases that include this string in the name')
+    parser.add_argument('--no-memory', action='store_true', help='do not measure peak memory')
+    parser.add_argument('--repeat', type=int, default=3, help='number of repeats of each time measurement')
+    parser.add_argument('--save', metavar='PATH', help='save curves as JSON')
+    args = parser.parse_args()
+
+    curves = run(args.lengths, args.sizes, args.filter, not args.no_memory, args.repeat)
+    report(curves)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({
+                case: [{'dictionary': n, 'words': w, 'seconds': t, 'peak_bytes': m} for n, w, t, m in points]
+                for case, points in curves.items()
+            }, f, indent=2)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
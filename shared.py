@@ -0,0 +1,294 @@
+from typing import overload, Iterable, Iterator, TYPE_CHECKING
+import bisect
+import struct
+import sys
+
+from .wordtable import WordTable
+
+if TYPE_CHECKING:
+    from multiprocessing import shared_memory
+
+
+HEADER = struct.Struct('<4sIII')
+MAGIC = b'WPY1'
+
+
+def letter_mask(letters: Iterable[str]) -> int:
+    """ Make a bit mask of letters.
+    The bit 0 is "a", and the bit 25 is "z".
+
+    >>> bin(letter_mask("abe"))
+    '0b10011'
+    """
+
+    mask = 0
+    for l in letters:
+        mask |= 1 << (ord(l) - ord('a'))
+    return mask
+
+
+class SharedWords:
+    """ A dictionary and its derived arrays, published in shared memory.
+
+    The publisher process creates it once using `SharedWords.publish`, and worker processes attach it by name using `SharedWords.attach`.
+    Workers get read-only `SharedWordTable`s that refer the shared memory without copying words.
+
+    The shared memory contains these arrays.
+
+    - word matrix: n words * length bytes of ASCII letters.
+    - letter masks: uint32 bit masks of letters that each word includes.
+    - ranked: word ids in the order of MajorLetterSolver.
+    - markset: word ids of the initial markset of MarkSolver.
+    - sorted: word ids in alphabetical order, for lookups.
+
+    >>> shared = SharedWords.publish(WordTable(["hello", "world", "heart"]))
+    >>> worker = SharedWords.attach(shared.name)
+
+    >>> worker.words
+    SharedWordTable(['hello', 'world', 'heart'])
+    >>> worker.ranked
+    SharedWordTable(['world', 'heart', 'hello'])
+    >>> worker.markset
+    SharedWordTable(['world', 'heart'])
+    >>> "world" in worker.words
+    True
+
+    Solvers use the precomputed arrays only if candidates are all words of the dictionary.
+
+    >>> from wordpy.game import FixedGame
+    >>> from wordpy.solver import MajorLetterSolver
+    >>> MajorLetterSolver(FixedGame(worker.words, "hello")).words
+    SharedWordTable(['world', 'heart', 'hello'])
+    >>> MajorLetterSolver(FixedGame(worker.markset, "heart")).words
+    WordTable(['world', 'heart'])
+
+    >>> worker.close()
+    >>> shared.unlink()
+    """
+
+    def __init__(self, shm: 'shared_memory.SharedMemory', owner: bool = False):
+        self.shm = shm
+        self.owner = owner
+
+        magic, count, length, num_marks = HEADER.unpack_from(shm.buf)
+        if magic != MAGIC:
+            raise ValueError(f'{shm.name} is not a shared wordpy dictionary')
+
+        self.length = length
+
+        buf = shm.buf.toreadonly()
+        offset = HEADER.size
+
+        self.matrix = buf[offset:offset + count * length]
+        offset += (count * length + 3) // 4 * 4
+
+        arrays = []
+        for size in (count, count, num_marks, count):
+            arrays.append(buf[offset:offset + size * 4].cast('I'))
+            offset += size * 4
+        self.masks, ranked, markset, self.sorted = arrays
+
+        self.words = SharedWordTable(self, 'words', None)
+        self.ranked = SharedWordTable(self, 'ranked', ranked)
+        self.markset = SharedWordTable(self, 'markset', markset)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @classmethod
+    def publish(cls, words: WordTable, name: str | None = None) -> 'SharedWords':
+        """ Publish words into a new shared memory block.
+        The caller owns the block, and should call `unlink` when all workers finished.
+
+        >>> SharedWords.publish(WordTable(["hello", "word-"]))
+        Traceback (most recent call last):
+            ...
+        ValueError: all words must be lowercase ASCII letters and have the same length
+        """
+
+        from multiprocessing import shared_memory
+        from .game import FixedGame
+        from .solver import MarkSolver
+
+        words = WordTable(words)
+        if len(words) == 0:
+            raise ValueError('can not publish an empty dictionary')
+
+        length = len(words[0])
+        if not all(len(w) == length and w.isascii() and w.isalpha() and w.islower() for w in words):
+            raise ValueError('all words must be lowercase ASCII letters and have the same length')
+        matrix = b''.join(w.encode('ascii') for w in words)
+
+        ids = {w: i for i, w in enumerate(words)}
+        solver = MarkSolver(FixedGame(words, words[0]))
+        ranked = [ids[w] for w in solver.words]
+        markset = [ids[w] for w in solver.markset]
+
+        arrays = [
+            [letter_mask(w) for w in words],
+            ranked,
+            markset,
+            sorted(range(len(words)), key=lambda i: words[i]),
+        ]
+
+        padded = (len(matrix) + 3) // 4 * 4
+        size = HEADER.size + padded + sum(len(a) for a in arrays) * 4
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        try:
+            HEADER.pack_into(shm.buf, 0, MAGIC, len(words), length, len(markset))
+            offset = HEADER.size
+            shm.buf[offset:offset + len(matrix)] = matrix
+            offset += padded
+            for a in arrays:
+                shm.buf[offset:offset + len(a) * 4] = struct.pack(f'{len(a)}I', *a)
+                offset += len(a) * 4
+        except:
+            shm.close()
+            shm.unlink()
+            raise
+
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedWords':
+        """ Attach to a shared dictionary that published by another process. """
+
+        if name in _attached:
+            return _attached[name]
+
+        from multiprocessing import shared_memory
+
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+
+        result = _attached[name] = cls(shm)
+        return result
+
+    def word(self, idx: int) -> str:
+        return bytes(self.matrix[idx * self.length:(idx + 1) * self.length]).decode('ascii')
+
+    def index(self, word: str) -> int:
+        """ Get the id of the word, or -1 if the word is not in the dictionary. """
+
+        i = bisect.bisect_left(self.sorted, word, key=self.word)
+        if i < len(self.sorted) and self.word(self.sorted[i]) == word:
+            return self.sorted[i]
+        return -1
+
+    def close(self) -> None:
+        """ Detach from the shared memory.
+        SharedWordTables of this dictionary can not be used after closed.
+        """
+
+        _attached.pop(self.name, None)
+        for table in (self.words, self.ranked, self.markset):
+            table.release()
+        for view in (self.matrix, self.masks, self.sorted):
+            view.release()
+        self.shm.close()
+
+    def unlink(self) -> None:
+        """ Close and destroy the shared memory. Only the publisher should call this. """
+
+        self.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def __enter__(self) -> 'SharedWords':
+        return self
+
+    def __exit__(self, *args) -> None:
+        if self.owner:
+            self.unlink()
+        else:
+            self.close()
+
+
+_attached: dict[str, SharedWords] = {}
+
+
+def _attach_table(name: str, kind: str) -> 'SharedWordTable':
+    return getattr(SharedWords.attach(name), kind)
+
+
+class SharedWordTable(WordTable):
+    """ A read-only WordTable that refers words in shared memory.
+
+    Filtering methods and slices return normal WordTables.
+    Pickling a SharedWordTable sends only the name of the shared memory, so the receiver attaches it instead of copying words.
+    """
+
+    def __init__(self, shared: SharedWords, kind: str, order: memoryview | None):
+        self.shared = shared
+        self.kind = kind
+        self.order = order
+
+    def release(self) -> None:
+        if self.order is not None:
+            self.order.release()
+
+    def ids(self) -> Iterable[int]:
+        return range(len(self.shared.masks)) if self.order is None else self.order
+
+    def take_matches(self, pattern: str, includes: Iterable[str] | str = None) -> WordTable:
+        mask = letter_mask(includes or '')
+        masks = self.shared.masks
+        return WordTable(self.__filter(
+            lambda w: all(p == '.' or w == p for p, w in zip(pattern, w)),
+            (i for i in self.ids() if masks[i] & mask == mask),
+        ))
+
+    def drop_by_letters(self, letters: Iterable[str]) -> WordTable:
+        mask = letter_mask(letters)
+        masks = self.shared.masks
+        return WordTable(self.shared.word(i) for i in self.ids() if masks[i] & mask == 0)
+
+    def drop_wrong(self, pattern: str) -> WordTable:
+        return WordTable(self.__filter(
+            lambda w: all(p == '.' or w != p for w, p in zip(w, pattern)),
+            self.ids(),
+        ))
+
+    def __filter(self, pred, ids: Iterable[int]) -> Iterator[str]:
+        return (w for w in map(self.shared.word, ids) if pred(w))
+
+    def __iter__(self) -> Iterator[str]:
+        return map(self.shared.word, self.ids())
+
+    def __len__(self) -> int:
+        return len(self.ids())
+
+    def __contains__(self, word: object) -> bool:
+        if not isinstance(word, str) or len(word) != self.shared.length:
+            return False
+        idx = self.shared.index(word)
+        return idx >= 0 and (len(self) == len(self.shared.masks) or idx in self.order)
+
+    def __repr__(self) -> str:
+        return 'SharedWordTable(' + str(list(self)) + ')'
+
+    def __reduce__(self):
+        return (_attach_table, (self.shared.name, self.kind))
+
+    @overload
+    def __getitem__(self, idx: int) -> str:
+        ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> WordTable:
+        ...
+
+    def __getitem__(self, idx: int | slice) -> str | WordTable:
+        if isinstance(idx, int):
+            try:
+                return self.shared.word(self.ids()[idx])
+            except IndexError:
+                raise IndexError(f'out of index: {idx} of {len(self)}')
+        elif isinstance(idx, slice):
+            return WordTable(map(self.shared.word, self.ids()[idx]))
+        else:
+            raise ValueError(f'invalid index: {idx}')
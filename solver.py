@@ -1,12 +1,21 @@
 import random
 import functools
-from typing import Set
+from typing import Callable, Iterable, Sequence, Set, TYPE_CHECKING
 from abc import ABC, abstractmethod
 from collections import Counter
 import itertools
+import math
+import time
 
+from . import cache
+from .parallel import ChunkExecutor, filter_state, letter_scores, mark_scores
 from .wordtable import WordTable
-from .game import Game, GameState
+from .game import Game, GameState, feedback
+from .sampling import SampleReport, sample_size, margin_of_error, stratified_sample
+from .shared import SharedWordTable
+
+if TYPE_CHECKING:
+    from .tracelog import TraceRecorder
 
 
 def default_logger(state: GameState, submitted: str, correct: bool):
@@ -14,10 +23,58 @@ def default_logger(state: GameState, submitted: str, correct: bool):
 
 
 class Solver(ABC):
+    # error tolerance of approximate scoring, or None to score using all words.
+    tolerance: float | None = None
+
+    # always score exactly if the number of words is not more than this.
+    exact_threshold: int = 2000
+
+    # seed for sampling words, to make the approximate scoring reproducible.
+    sample_seed: int = 0
+
+    # executor to run filtering and scoring in chunks on many cores, or None to run serially.
+    executor: ChunkExecutor | None = None
+
     def __init__(self, game: Game):
         self.words = game.candidates
         self.game = game
 
+        # reports of sampling, one for each scoring in approximate mode.
+        self.sample_reports: list[SampleReport] = []
+        self.__rand = random.Random(self.sample_seed)
+
+    @classmethod
+    def approximate(cls, tolerance: float, exact_threshold: int | None = None) -> type['Solver']:
+        """ Make a solver class that scores against samples of words, within the error tolerance.
+
+        MajorLetterSolver and its subclasses rank only the sampled words, and rank the other words when the candidates become fewer than exact_threshold.
+        MarkSolver samples only the letters of candidates; scoring its markset is always exact, so it is not faster than the exact mode.
+
+        >>> MarkSolver.approximate(0.02).__name__
+        'MarkSolver(tolerance=0.02)'
+        """
+
+        attrs: dict[str, float | int] = {'tolerance': tolerance}
+        if exact_threshold is not None:
+            attrs['exact_threshold'] = exact_threshold
+        return type(f'{cls.__name__}(tolerance={tolerance})', (cls, ), attrs)
+
+    @classmethod
+    def parallel(cls, workers: int | None = None, **kwargs) -> type['Solver']:
+        """ Make a solver class that filters and scores words in chunks on many workers.
+        Keyword arguments are passed to ChunkExecutor.
+
+        >>> MarkSolver.parallel(4).__name__
+        'MarkSolver(workers=4)'
+        """
+
+        executor = ChunkExecutor(workers, **kwargs)
+        return type(f'{cls.__name__}(workers={executor.workers})', (cls, ), {'executor': executor})
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """ Clear precomputations that cached in this process, to measure them again. """
+
     @property
     def state(self) -> GameState:
         return self.game.state
@@ -26,18 +83,93 @@ class Solver(ABC):
     def guess(self) -> WordTable:
         raise NotImplementedError()
 
-    def solve(self, log=default_logger) -> GameState:
+    def solve(self, log=default_logger, recorder: 'TraceRecorder | None' = None) -> GameState:
+        """ Play the game until solved.
+        If recorder is given, the submitted words, their feedback and time to guess are recorded.
+        """
+
         correct = False
         while not correct:
+            start = time.perf_counter()
             word = self.guess()[0]
+            elapsed = time.perf_counter() - start
             correct = self.game.submit(word)
+            if recorder is not None:
+                recorder.record(word, self.state, elapsed)
             log(self.state, word, correct)
+        if recorder is not None:
+            recorder.finish()
         return self.state
 
+    def sample(self, words: WordTable) -> WordTable:
+        """ Get words for scoring.
+        If tolerance is set and there are many words, returns a stratified random sample of them.
+        Otherwise returns words as is.
+        """
+
+        if self.tolerance is None:
+            return words
+
+        population = len(words)
+        size = population
+        if population > self.exact_threshold:
+            size = sample_size(population, self.tolerance)
+
+        self.sample_reports.append(SampleReport(population, size, margin_of_error(population, size)))
+
+        if size >= population:
+            return words
+        return WordTable(stratified_sample(list(words), size, self.__rand), words.vocabulary)
+
     def drop_words_by_state(self) -> None:
-        self.words = self.words.take_matches(self.state.found, self.state.includes)
+        self.words = self.filter_by_state(self.words)
+
+    def filter_by_state(self, words: WordTable) -> WordTable:
+        """ Take words that can be the answer in the current state. """
+
+        if self.executor is not None and self.executor.should_split(len(words)):
+            return WordTable(self.executor.map(
+                filter_state,
+                words,
+                self.state.found,
+                self.state.includes,
+                self.state.wrongs[-1] if len(self.state.wrongs) > 0 else None,
+                self.state.not_includes,
+            ), words.vocabulary)
+
+        words = words.take_matches(self.state.found, self.state.includes)
         if len(self.state.wrongs) > 0:
-            self.words = self.words.drop_wrong(self.state.wrongs[-1]).drop_by_letters(self.state.not_includes)
+            words = words.drop_wrong(self.state.wrongs[-1]).drop_by_letters(self.state.not_includes)
+        return words
+
+
+def sort_by_scores(words: Sequence[str], kernel: Callable[..., list[int]], *args, executor: ChunkExecutor | None = None) -> list[str]:
+    """ Sort words by scores that the kernel calculates, in descending order.
+    Words of the same score keep their order.
+    """
+
+    if executor is None:
+        scores = kernel(words, *args)
+    else:
+        scores = executor.map(kernel, words, *args)
+    return [words[i] for i in sorted(range(len(scores)), key=scores.__getitem__, reverse=True)]
+
+
+def count_ranking(words: Iterable[str], answer_length: int) -> list[list[str]]:
+    """ Rank letters at each position by frequency. """
+
+    return [
+        [c for (c, _) in Counter(w[i] for w in words).most_common()]
+        for i in range(answer_length)
+    ]
+
+
+def is_shared_dictionary(words: WordTable) -> bool:
+    """ Check if words are all words of a shared dictionary, so solvers can use its precomputed arrays.
+    The precomputed arrays are exact, so tolerance and executor are not used for them.
+    """
+
+    return isinstance(words, SharedWordTable) and words.kind == 'words'
 
 
 class RandomSolver(Solver):
@@ -51,27 +183,75 @@ class RandomSolver(Solver):
 
 
 class MajorLetterSolver(Solver):
+    # bump this when the ranking changes, to invalidate the persistent cache.
+    ranking_version = 1
+
     @functools.lru_cache(maxsize=8)
     @staticmethod
-    def __sort_words(words: WordTable, answer_length: int) -> WordTable:
-        ranking = [
-            [c for (c, _) in Counter(w[i] for w in words).most_common()]
-            for i in range(answer_length)
-        ]
-
-        def calc_score(word: str):
-            return sum(
-                26 - idx
-                for i, (w, idx) in enumerate((w, ranking[i].index(w)) for i, w in enumerate(word))
-                if idx >= 0 and w not in word[:i]
-            )
-
-        return WordTable(sorted(words, key=calc_score, reverse=True))
+    def __sort_words(words: WordTable, answer_length: int, sample: WordTable | None = None, executor: ChunkExecutor | None = None) -> WordTable:
+        """ Sort words by frequency of letters.
+        If sample is given, the frequency is counted from the sample and only the sample is sorted and returned.
+        """
+
+        def sort_words() -> list[str]:
+            counted = words if sample is None else sample
+            return sort_by_scores(list(counted), letter_scores, count_ranking(counted, answer_length), executor=executor)
+
+        # samples differ in each game, so rankings of them are not stored.
+        if sample is not None or not cache.is_registered(words):
+            return WordTable(sort_words(), words.vocabulary)
+
+        key = f'{MajorLetterSolver.ranking_version}-{cache.fingerprint(words)}'
+        return WordTable(cache.cached(
+            'MajorLetterSolver',
+            key,
+            sort_words,
+            lambda ranked: len(ranked) == len(words) and all(w in words for w in ranked),
+        ), words.vocabulary)
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        super().clear_cache()
+        MajorLetterSolver.__sort_words.cache_clear()
 
     def __init__(self, game: Game):
         super().__init__(game)
 
-        self.words = MajorLetterSolver.__sort_words(game.candidates, game.answer_length)
+        # candidates that are not ranked yet, because they are not in the sample.
+        # they are ranked when the candidates become few enough to score exactly.
+        self.unscored = WordTable([], game.candidates.vocabulary)
+
+        if is_shared_dictionary(game.candidates):
+            self.words = game.candidates.shared.ranked
+        else:
+            sample = self.sample(game.candidates)
+            self.words = MajorLetterSolver.__sort_words(
+                game.candidates,
+                game.answer_length,
+                None if sample is game.candidates else sample,
+                self.executor,
+            )
+            if sample is not game.candidates:
+                self.ranking = count_ranking(sample, game.answer_length)
+                self.unscored = game.candidates - sample
+
+    def rank(self, words: WordTable) -> WordTable:
+        """ Sort words by the ranking of letters that counted from the sample. """
+
+        return WordTable(sort_by_scores(list(words), letter_scores, self.ranking, executor=self.executor), words.vocabulary)
+
+    def drop_words_by_state(self) -> None:
+        super().drop_words_by_state()
+
+        if len(self.unscored) > 0:
+            self.unscored = self.filter_by_state(self.unscored)
+            if len(self.words) + len(self.unscored) <= self.exact_threshold or len(self.words) == 0:
+                self.words = self.rank(self.words | self.unscored)
+                self.unscored = WordTable([], self.words.vocabulary)
+
+        if self.tolerance is not None:
+            population = len(self.words) + len(self.unscored)
+            self.sample_reports.append(SampleReport(population, len(self.words), margin_of_error(population, len(self.words))))
 
     def guess(self) -> WordTable:
         self.drop_words_by_state()
@@ -83,23 +263,61 @@ class MinorLetterSolver(MajorLetterSolver):
     @functools.lru_cache(maxsize=8)
     @staticmethod
     def __reverse_words(words: WordTable) -> WordTable:
-        return WordTable(reversed(words))
+        return WordTable(list(words)[::-1], words.vocabulary)
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        super().clear_cache()
+        MinorLetterSolver.__reverse_words.cache_clear()
 
     def __init__(self, game: Game):
         super().__init__(game)
 
         self.words = MinorLetterSolver.__reverse_words(self.words)
 
+    def rank(self, words: WordTable) -> WordTable:
+        return WordTable(list(super().rank(words))[::-1], words.vocabulary)
+
 
 class MarkSolver(MajorLetterSolver):
+    # bump this when the initial markset changes, to invalidate the persistent cache.
+    markset_version = 1
+
+    @functools.lru_cache(maxsize=8)
+    @staticmethod
+    def __make_markset(words: WordTable, persistent: bool = True) -> WordTable:
+        def make_markset() -> list[str]:
+            return [
+                word
+                for word in words
+                if all(w not in word[:i] for i, w in enumerate(word))
+            ]
+
+        if not persistent or not cache.is_registered(words):
+            return WordTable(make_markset(), words.vocabulary)
+
+        key = f'{MarkSolver.markset_version}-{cache.fingerprint(words)}'
+        return WordTable(cache.cached(
+            'MarkSolver',
+            key,
+            make_markset,
+            lambda markset: all(w in words for w in markset),
+        ), words.vocabulary)
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        super().clear_cache()
+        MarkSolver.__make_markset.cache_clear()
+
     def __init__(self, game: Game):
         super().__init__(game)
 
-        self.markset = WordTable(
-            word
-            for word in self.words
-            if all(w not in word[:i] for i, w in enumerate(word))
-        )
+        if is_shared_dictionary(game.candidates):
+            self.markset = game.candidates.shared.markset
+        else:
+            # words are ranked from a sample in approximate mode, so the markset of them is not stored.
+            words = self.words if len(self.unscored) == 0 else self.words | self.unscored
+            self.markset = MarkSolver.__make_markset(words, self.tolerance is None)
         self.tried: Set[str] = set()
 
     def guess(self) -> WordTable:
@@ -111,7 +329,7 @@ class MarkSolver(MajorLetterSolver):
             # letters that can be included in the answer.
             candidates = set(itertools.chain.from_iterable(
                 (c for c, f in zip(word, self.state.found) if f == '.')
-                for word in self.words
+                for word in self.sample(self.words)
             ))
             positional_candidates = [
                 set(
@@ -125,15 +343,15 @@ class MarkSolver(MajorLetterSolver):
             # letters that included in the answer but position is still undetermined.
             float_chars = self.state.includes - set(self.state.found)
 
-            self.markset = WordTable(sorted(
-                (w for w in self.markset if w != self.state.last_tried),
-                key=lambda word: (
-                    100 * sum(t not in word for t in self.tried) # try to use untried letter first.
-                    + 10000 * sum(w in cs or self.state.found[i] != '.' for i, (cs, w) in enumerate(zip(positional_candidates, word))) # prefer to use candidate letters.
-                    + sum(i in word for i in float_chars) # prefer to use candidate float letters.
-                ),
-                reverse=True,
-            ))
+            self.markset = WordTable(sort_by_scores(
+                [w for w in self.markset if w != self.state.last_tried],
+                mark_scores,
+                self.tried,
+                positional_candidates,
+                self.state.found,
+                float_chars,
+                executor=self.executor,
+            ), self.markset.vocabulary)
 
         if ('.' not in self.state.found
             or len(self.markset) == 0
@@ -142,3 +360,168 @@ class MarkSolver(MajorLetterSolver):
             return self.words[:10]
         else :
             return self.markset[:10]
+
+
+def partition(guess: str, answers: list[str]) -> dict[str, list[str]]:
+    """ Group possible answers by the feedback of the guess.
+
+    >>> partition("hello", ["hello", "world", "heart", "lemon"])
+    {'ggggg': ['hello'], '..ygy': ['world'], 'gg...': ['heart'], '.gyyy': ['lemon']}
+    """
+
+    groups: dict[str, list[str]] = {}
+    for answer in answers:
+        groups.setdefault(feedback(guess, answer), []).append(answer)
+    return groups
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class LookaheadSolver(MajorLetterSolver):
+    """ Search some plies of guess -> feedback -> guess, to minimize the number of attempts.
+
+    The search is deepened one ply at a time, and the best guess of the deepest finished search is returned when time_budget seconds passed.
+    Guesses are tried in the order of MajorLetterSolver, and branches that can not beat the best guess found so far are pruned.
+
+    objective is "expected" to minimize the average number of attempts, or "worst" to minimize it in the worst case.
+    Configure it per deployment by passing arguments, or by making a subclass that overrides the class attributes.
+
+    >>> from wordpy.game import FixedGame
+    >>> words = WordTable(["power", "spice", "tasty", "store", "fight", "night", "mouse"])
+    >>> MajorLetterSolver(FixedGame(words, "night")).guess()[0]
+    'power'
+    >>> LookaheadSolver(FixedGame(words, "night"), time_budget=10).guess()[0]
+    'spice'
+    >>> LookaheadSolver(FixedGame(words, "night"), time_budget=10, objective='worst').guess()[0]
+    'fight'
+
+    If no search finished in time, guesses are in the order of MajorLetterSolver.
+
+    >>> solver = LookaheadSolver(FixedGame(words, "night"), time_budget=10)
+    >>> solver.guess()[0], solver.searched_depth
+    ('spice', 3)
+    >>> solver.time_budget = 0
+    >>> solver.guess() == MajorLetterSolver(FixedGame(words, "night")).guess(), solver.searched_depth
+    (True, 0)
+    """
+
+    time_budget: float = 1.0
+    max_depth: int = 3
+    width: int = 20
+    objective: str = 'expected'
+
+    # an assumed number of feedback groups per guess, for estimating unsearched branches.
+    branching: float = 8.0
+
+    def __init__(
+        self,
+        game: Game,
+        time_budget: float | None = None,
+        max_depth: int | None = None,
+        width: int | None = None,
+        objective: str | None = None,
+    ):
+        super().__init__(game)
+
+        if time_budget is not None:
+            self.time_budget = time_budget
+        if max_depth is not None:
+            self.max_depth = max_depth
+        if width is not None:
+            self.width = width
+        if objective is not None:
+            self.objective = objective
+        if self.objective not in ('expected', 'worst'):
+            raise ValueError(f'invalid objective: {self.objective!r}')
+
+        self.solved = 'g' * game.answer_length
+        self.deadline = 0.0
+
+        # the depth of the latest finished search, for reporting.
+        self.searched_depth = 0
+
+    def guess(self) -> WordTable:
+        self.drop_words_by_state()
+        self.searched_depth = 0
+
+        if len(self.words) <= 2:
+            return self.words[:10]
+
+        answers = list(self.sample(self.words))
+        self.deadline = time.perf_counter() + self.time_budget
+        moves = list(self.words[:self.width])
+        scores = {w: math.inf for w in moves}
+
+        try:
+            for depth in range(1, self.max_depth + 1):
+                current: dict[str, float] = {}
+                best = math.inf
+                for move in moves:
+                    cost = self.__cost(move, answers, depth, best)
+                    current[move] = cost
+                    best = min(best, cost)
+
+                scores = current
+                self.searched_depth = depth
+                moves = sorted(moves, key=lambda w: scores[w])
+        except DeadlineExceeded:
+            # costs of the unfinished depth are not comparable, so use the scores of the deepest finished depth.
+            pass
+
+        return WordTable(sorted(moves, key=lambda w: scores[w])[:10], self.words.vocabulary)
+
+    def lower_bound(self, n: int) -> float:
+        """ The number of attempts to solve n candidates when guessing one of them by luck. """
+
+        return 1 if n == 1 else 2 - 1 / n
+
+    def estimate(self, n: int) -> float:
+        """ Rough number of attempts to solve n candidates without searching. """
+
+        return self.lower_bound(n) + math.log(max(n / 2, 1)) / math.log(self.branching)
+
+    def __best(self, answers: list[str], depth: int, bound: float) -> float:
+        if len(answers) == 1:
+            return 1
+        if depth == 0:
+            return self.estimate(len(answers))
+
+        best = bound
+        for move in answers[:self.width]:
+            best = min(best, self.__cost(move, answers, depth, best))
+        return best
+
+    def __cost(self, guess: str, answers: list[str], depth: int, bound: float) -> float:
+        """ Number of attempts including this guess, or inf if it can not be less than bound. """
+
+        if time.perf_counter() > self.deadline:
+            raise DeadlineExceeded()
+
+        groups = sorted(
+            (g for f, g in partition(guess, answers).items() if f != self.solved),
+            key=len,
+            reverse=True,
+        )
+
+        if self.objective == 'worst':
+            total = 1.0
+            for g in groups:
+                total = max(total, 1 + self.__best(g, depth - 1, bound - 1))
+                if total >= bound:
+                    return math.inf
+            return total
+
+        n = len(answers)
+        total = 1.0
+        remaining = sum(len(g) * self.lower_bound(len(g)) for g in groups) / n
+        if total + remaining >= bound:
+            return math.inf
+
+        for g in groups:
+            remaining -= len(g) * self.lower_bound(len(g)) / n
+            total += len(g) * self.__best(g, depth - 1, (bound - total - remaining) * n / len(g)) / n
+            if total + remaining >= bound:
+                return math.inf
+        return total
@@ -0,0 +1,76 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+import copy
+
+from .game import GameState, TerminalGame
+from .solver import Solver, partition
+from .wordtable import WordTable
+
+
+class Speculation:
+    """ Compute next guesses in background while the user is typing the result of a word.
+
+    A guess is computed for each likely feedback of the word, in the order of the number of candidates that give the feedback.
+    When the real result is known, `take` returns the guess for it and cancels the others.
+    The solver and the game are copied for each feedback, so the original ones are not changed.
+
+    >>> from wordpy.solver import MajorLetterSolver
+    >>> words = WordTable(["hello", "world", "heart", "hover"])
+    >>> solver = MajorLetterSolver(TerminalGame(words))
+    >>> solver.guess()[0]
+    'world'
+    >>> speculation = Speculation(solver, 'world')
+
+    >>> solver.game.apply_result('world', '.o...', 'r')
+    False
+    >>> next_solver, guesses = speculation.take(solver.game.state)
+    >>> guesses
+    WordTable(['hover'])
+    """
+
+    def __init__(self, solver: Solver, word: str, max_speculations: int = 8):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='wordpy-speculation')
+        self.states: list[GameState] = []
+        self.futures: list[Future[tuple[Solver, WordTable]]] = []
+
+        groups = sorted(partition(word, list(solver.words)).items(), key=lambda x: len(x[1]), reverse=True)
+        for pattern, _ in groups[:max_speculations]:
+            if 'g' * len(word) == pattern:
+                continue
+
+            game = copy.deepcopy(solver.game)
+            if not isinstance(game, TerminalGame):
+                raise TypeError('speculation needs a TerminalGame')
+            game.apply_result(
+                word,
+                ''.join(w if f == 'g' else '.' for w, f in zip(word, pattern)),
+                ''.join(w for w, f in zip(word, pattern) if f == 'y'),
+            )
+
+            # copy the solver here, so the worker does not read the solver while the main thread uses it.
+            snapshot = copy.deepcopy(solver, {id(solver.game): game})
+
+            self.states.append(game.state)
+            self.futures.append(self.executor.submit(Speculation.__run, snapshot))
+
+        self.executor.shutdown(wait=False)
+
+    @staticmethod
+    def __run(solver: Solver) -> tuple[Solver, WordTable]:
+        return solver, solver.guess()
+
+    def cancel(self) -> None:
+        for f in self.futures:
+            f.cancel()
+
+    def take(self, state: GameState) -> tuple[Solver, WordTable] | None:
+        """ Get the solver and the guess for the state, or None if the state was not speculated. """
+
+        for s, f in zip(self.states, self.futures):
+            if s == state:
+                for other in self.futures:
+                    if other is not f:
+                        other.cancel()
+                return f.result()
+
+        self.cancel()
+        return None
@@ -0,0 +1,72 @@
+""" Benchmark startup time of the solver tool
+
+Measures the import time of the package, and the time until the first suggestion with a cold and a warm cache.
+
+$ python3.10 -m wordpy.startup
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+
+PACKAGE = __package__ or 'wordpy'
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_SUGGESTION = f'''
+import {PACKAGE} as wordpy
+from {PACKAGE}.solver import MarkSolver
+MarkSolver(wordpy.TerminalGame(wordpy.get_words())).guess()
+'''
+
+
+def run(code: str, cache_dir: str, *flags: str) -> tuple[float, str]:
+    env = dict(os.environ, WORDPY_CACHE_DIR=cache_dir, PYTHONPATH=ROOT)
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, *flags, '-c', code], env=env, cwd=ROOT, capture_output=True, text=True, check=True)
+    return time.perf_counter() - start, result.stderr
+
+
+def import_time(cache_dir: str) -> tuple[float, list[tuple[str, float]]]:
+    """ Get the total import time of the package, and the slowest modules, in seconds. """
+
+    _, log = run(f'import {PACKAGE}', cache_dir, '-X', 'importtime')
+
+    modules: list[tuple[str, float]] = []
+    total = 0.0
+    for line in log.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix('import time:').split('|')
+        name = name.strip()
+        modules.append((name, int(self_us) / 1e6))
+        if name == PACKAGE:
+            total = int(cumulative_us) / 1e6
+
+    return total, sorted(modules, key=lambda x: x[1], reverse=True)[:10]
+
+
+def benchmark(num_tries: int = 5) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as cache_dir:
+        total, modules = import_time(cache_dir)
+        cold, _ = run(FIRST_SUGGESTION, cache_dir)
+        warm = min(run(FIRST_SUGGESTION, cache_dir)[0] for _ in range(num_tries))
+        empty = min(run('pass', cache_dir)[0] for _ in range(num_tries))
+
+    print(f'import {PACKAGE}: {total*1000:.1f} ms')
+    for name, t in modules:
+        print(f'  {name:30s} {t*1000:6.1f} ms')
+    print(f'first suggestion (cold cache): {(cold - empty)*1000:.1f} ms')
+    print(f'first suggestion (warm cache): {(warm - empty)*1000:.1f} ms')
+
+    return {
+        'import': total,
+        'cold': cold - empty,
+        'warm': warm - empty,
+    }
+
+
+if __name__ == '__main__':
+    benchmark()
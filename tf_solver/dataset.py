@@ -1,4 +1,7 @@
 from typing import Iterable
+import glob
+import multiprocessing
+import os
 import string
 import random
 
@@ -7,6 +10,10 @@ import numpy
 import wordpy
 
 
+SHARD_SIZE = 4096
+FIELDS = ('possibilities', 'includes', 'answers')
+
+
 class StateCollectSolver(wordpy.Solver):
     def __init__(self, game: wordpy.Game):
         super().__init__(game)
@@ -63,30 +70,106 @@ def decode(data: numpy.ndarray) -> wordpy.WordTable:
     ]
 
 
-def generate_dataset(n=100):
-    words = wordpy.get_words()
-    possibilities = []
-    includes = []
-    ys = []
-    for i in range(n):
-        if i%10 == 0:
-            print(f'\r{i/n:6.1%}', end='')
-        answer = random.choice(words)
-        game = wordpy.FixedGame(words, answer)
-        solver = StateCollectSolver(game)
-        solver.solve(lambda x, y, z: None)
-        possibilities.extend(encode_x(solver.possibilities))
-        includes.extend(encode_includes(solver.includes))
-        ys.extend(encode_y([answer] * len(solver.possibilities)))
-    print('\r100.0%')
+def play_game(words: wordpy.WordTable) -> dict[str, numpy.ndarray]:
+    answer = random.choice(words)
+    game = wordpy.FixedGame(words, answer)
+    solver = StateCollectSolver(game)
+    solver.solve(lambda x, y, z: None)
 
     return {
-        'possibilities': numpy.array(possibilities),
-        'includes': numpy.array(includes),
-        'answers': numpy.array(ys),
+        'possibilities': encode_x(solver.possibilities).astype(numpy.float32),
+        'includes': encode_includes(solver.includes).astype(numpy.float32),
+        'answers': encode_y([answer] * len(solver.possibilities)).astype(numpy.int32),
     }
 
 
+class ShardWriter:
+    """ Write examples into fixed-size .npy shards as they are generated.
+
+    Each shard is stored as one file per field, named like `{prefix}-{index:05d}.{field}.npy`.
+    Only the last shard of a writer can be smaller than shard_size.
+    """
+
+    def __init__(self, directory: str, prefix: str, shard_size: int = SHARD_SIZE):
+        self.directory = directory
+        self.prefix = prefix
+        self.shard_size = shard_size
+        self.num_shards = 0
+        self.buffers: dict[str, list[numpy.ndarray]] = {name: [] for name in FIELDS}
+        self.buffered = 0
+
+    def write(self, examples: dict[str, numpy.ndarray]) -> None:
+        for name in FIELDS:
+            self.buffers[name].append(examples[name])
+        self.buffered += len(examples['answers'])
+
+        while self.buffered >= self.shard_size:
+            self.flush(self.shard_size)
+
+    def flush(self, size: int | None = None) -> None:
+        if self.buffered == 0:
+            return
+
+        size = min(size or self.buffered, self.buffered)
+        for name in FIELDS:
+            data = numpy.concatenate(self.buffers[name])
+            numpy.save(f'{self.directory}/{self.prefix}-{self.num_shards:05d}.{name}.npy', data[:size])
+            self.buffers[name] = [data[size:]]
+
+        self.buffered -= size
+        self.num_shards += 1
+
+
+def generate_shards(job: tuple[int, int, int, str, int]) -> int:
+    """ Play games in a worker process and write them as shards.
+
+    The job is (job index, number of games, seed, output directory, shard size).
+    Returns the number of written shards.
+    """
+
+    index, n, seed, directory, shard_size = job
+
+    random.seed(seed)
+    words = wordpy.get_words()
+
+    writer = ShardWriter(directory, f'{index:05d}', shard_size)
+    for _ in range(n):
+        writer.write(play_game(words))
+    writer.flush()
+
+    return writer.num_shards
+
+
+def generate_dataset(n=100, directory='output/dataset', processes=None, seed=0, games_per_job=500, shard_size=SHARD_SIZE) -> int:
+    """ Generate dataset across a process pool, and write it into directory as .npy shards.
+
+    Every job has its own seed derived from seed, so the result does not depend on the number of processes.
+    Returns the number of written shards.
+    """
+
+    os.makedirs(directory, exist_ok=True)
+    for old in glob.glob(f'{directory}/*.npy'):
+        os.remove(old)
+
+    # download and cache the dictionary once here, so workers do not download it at the same time.
+    wordpy.get_words()
+
+    jobs = [
+        (i, min(games_per_job, n - start), seed + i, directory, shard_size)
+        for i, start in enumerate(range(0, n, games_per_job))
+    ]
+
+    played = 0
+    num_shards = 0
+    with multiprocessing.Pool(processes) as pool:
+        for job, shards in zip(jobs, pool.imap(generate_shards, jobs)):
+            played += job[1]
+            num_shards += shards
+            print(f'\r{played/n:6.1%}', end='')
+    print('\r100.0%')
+
+    return num_shards
+
+
 if __name__ == '__main__':
-    data = generate_dataset(10000)
-    numpy.savez_compressed('output/dataset.npz', **data)
+    generate_dataset(10000)
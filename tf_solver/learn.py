@@ -1,6 +1,10 @@
+import glob
+
 import tensorflow as tf
 import numpy
 
+from dataset import FIELDS
+
 
 def make_small_model():
     inp = tf.keras.layers.Input(shape=(5, 26), name='possibilities_input')
@@ -48,25 +52,85 @@ def make_large_model():
     return model
 
 
-def load_dataset():
-    dat = numpy.load('output/dataset.npz')
-    data_size = dat['answers'].shape[0]
-    indices = numpy.random.permutation(data_size)
-    train_idx, test_idx = indices[min(100, data_size//10):], indices[:min(100, data_size//10)]
-    train_x = {'possibilities_input': dat['possibilities'][train_idx], 'includes_input': dat['includes'][train_idx]}
-    train_y = dat['answers'][train_idx]
-    test_x = {'possibilities_input': dat['possibilities'][test_idx], 'includes_input': dat['includes'][test_idx]}
-    test_y = dat['answers'][test_idx]
+INPUT_SIGNATURE = (
+    {
+        'possibilities_input': tf.TensorSpec(shape=(5, 26), dtype=tf.float32),
+        'includes_input': tf.TensorSpec(shape=(26, ), dtype=tf.float32),
+    },
+    tf.TensorSpec(shape=(5, ), dtype=tf.int32),
+)
+
+
+def list_shards(directory='output/dataset') -> list[str]:
+    return sorted(p.removesuffix('.answers.npy') for p in glob.glob(f'{directory}/*.answers.npy'))
+
+
+def open_shard(prefix: str) -> dict[str, numpy.ndarray]:
+    return {name: numpy.load(f'{prefix}.{name}.npy', mmap_mode='r') for name in FIELDS}
+
+
+def read_shard(prefix: bytes, held_out: dict[str, set[int]]):
+    prefix = prefix.decode('utf-8')
+    shard = open_shard(prefix)
+    skip = held_out.get(prefix, set())
+    for i in range(shard['answers'].shape[0]):
+        if i not in skip:
+            yield {'possibilities_input': shard['possibilities'][i], 'includes_input': shard['includes'][i]}, shard['answers'][i]
+
+
+def load_dataset(directory='output/dataset', test_size=100, batch_size=32, shuffle_buffer=10000, seed=0):
+    """ Load shards as a streaming tf.data pipeline.
+
+    The test data is a random sample of up to test_size examples across all shards, at most 10% of the dataset, and loaded into memory.
+    Everything else is read through memory-mapped files while training.
+    """
+
+    shards = list_shards(directory)
+    if len(shards) == 0:
+        raise FileNotFoundError(f'no dataset shards in {directory}')
+
+    opened = [open_shard(p) for p in shards]
+    sizes = numpy.array([s['answers'].shape[0] for s in opened])
+    test_size = min(test_size, int(sizes.sum()) // 10)
+    if test_size == 0:
+        raise ValueError(f'dataset in {directory} is too small to hold out test data: {sizes.sum()} examples')
+
+    picked = numpy.sort(numpy.random.default_rng(seed).choice(sizes.sum(), test_size, replace=False))
+    offsets = numpy.cumsum(sizes) - sizes
+    shard_ids = numpy.searchsorted(offsets, picked, side='right') - 1
+
+    # (shard, index in the shard) of each test example.
+    locations = list(zip(shard_ids.tolist(), (picked - offsets[shard_ids]).tolist()))
+
+    held_out: dict[str, set[int]] = {}
+    for s, i in locations:
+        held_out.setdefault(shards[s], set()).add(i)
+
+    test_x = {
+        'possibilities_input': numpy.stack([opened[s]['possibilities'][i] for s, i in locations]),
+        'includes_input': numpy.stack([opened[s]['includes'][i] for s, i in locations]),
+    }
+    test_y = numpy.stack([opened[s]['answers'][i] for s, i in locations])
+
+    train = tf.data.Dataset.from_tensor_slices(shards)
+    train = train.shuffle(len(shards)).interleave(
+        lambda prefix: tf.data.Dataset.from_generator(lambda p: read_shard(p, held_out), args=(prefix, ), output_signature=INPUT_SIGNATURE),
+        cycle_length=min(len(shards), 8),
+        num_parallel_calls=tf.data.AUTOTUNE,
+        deterministic=False,
+    )
+    train = train.shuffle(shuffle_buffer).batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+    return train, (test_x, test_y)
 
-    return (train_x, train_y), (test_x, test_y)
 
 if __name__ == '__main__':
-    (train_x, train_y), (test_x, test_y) = load_dataset()
+    train, (test_x, test_y) = load_dataset()
 
     model = make_large_model()
     model.evaluate(test_x, test_y, verbose=2)
     print('-----')
-    model.fit(train_x, train_y, epochs=20)
+    model.fit(train, epochs=20)
     print('-----')
     model.evaluate(test_x, test_y, verbose=2)
 
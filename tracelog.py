@@ -0,0 +1,248 @@
+""" Recording and replaying games, for comparing solvers on identical workloads.
+
+>>> from wordpy.solver import MajorLetterSolver, MarkSolver
+>>> words = WordTable(["hello", "world", "heart", "hover"])
+>>> recorder = TraceRecorder(words)
+>>> MajorLetterSolver(FixedGame(words, "hover")).solve(lambda *_: None, recorder=recorder).num_tried
+2
+>>> trace = recorder.log[0]
+>>> [words[i] for i in trace.guesses], [decode_feedback(f, 5) for f in trace.feedback]
+(['world', 'hover'], ['.gy..', 'ggggg'])
+
+>>> restore(trace, words, 1).state.found
+'.o...'
+>>> replay(recorder.log, words, MarkSolver, log=lambda *_: None)
+[('MarkSolver', 2.0, 1.0)]
+
+>>> shrink(trace, words, MajorLetterSolver, lambda state: state.num_tried >= 2)
+0
+>>> shrink(trace, words, MajorLetterSolver, lambda state: state.num_tried > 2)
+-1
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Iterator, Type
+from array import array
+import struct
+import sys
+
+from . import cache
+from .game import FixedGame, GameState
+from .solver import Solver, default_logger
+from .wordtable import WordTable
+
+
+MAGIC = b'WPYT'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHH8sI')
+
+FEEDBACK_DIGITS = {'.': 0, 'y': 1, 'g': 2}
+
+
+def encode_feedback(pattern: str) -> int:
+    """ Encode a feedback pattern as a base-3 number.
+
+    >>> encode_feedback('.y.g.')
+    33
+    >>> decode_feedback(33, 5)
+    '.y.g.'
+    """
+
+    code = 0
+    for f in pattern:
+        code = code * 3 + FEEDBACK_DIGITS[f]
+    return code
+
+
+def decode_feedback(code: int, length: int) -> str:
+    pattern = ''
+    for _ in range(length):
+        code, digit = divmod(code, 3)
+        pattern = '.yg'[digit] + pattern
+    return pattern
+
+
+@dataclass(frozen=True)
+class GameTrace:
+    # id of the answer in the dictionary.
+    answer: int
+
+    # ids of the submitted words.
+    guesses: tuple[int, ...]
+
+    # feedback of each guess, encoded by encode_feedback.
+    feedback: tuple[int, ...]
+
+    # seconds that took to guess each word.
+    times: tuple[float, ...]
+
+
+class TraceLog:
+    """ Columnar log of games.
+    Every column is a flat array, so a log of many games is compact and quick to save and load.
+    """
+
+    def __init__(self, fingerprint: str, length: int):
+        self.fingerprint = fingerprint
+        self.length = length
+
+        self.answers = array('I')
+        self.counts = array('B')
+        self.guesses = array('I')
+        self.feedback = array('H' if 3 ** length <= 0xFFFF else 'I')
+        self.times = array('f')
+
+        self.__offsets = [0]
+
+    def append(self, trace: GameTrace) -> None:
+        self.answers.append(trace.answer)
+        self.counts.append(len(trace.guesses))
+        self.guesses.extend(trace.guesses)
+        self.feedback.extend(trace.feedback)
+        self.times.extend(trace.times)
+        self.__offsets.append(self.__offsets[-1] + len(trace.guesses))
+
+    def __len__(self) -> int:
+        return len(self.answers)
+
+    def __getitem__(self, idx: int) -> GameTrace:
+        idx = range(len(self))[idx]
+        start, end = self.__offsets[idx], self.__offsets[idx + 1]
+        return GameTrace(
+            answer=self.answers[idx],
+            guesses=tuple(self.guesses[start:end]),
+            feedback=tuple(self.feedback[start:end]),
+            times=tuple(self.times[start:end]),
+        )
+
+    def __iter__(self) -> Iterator[GameTrace]:
+        return (self[i] for i in range(len(self)))
+
+    def save(self, path: str) -> None:
+        columns = [self.answers, self.counts, self.guesses, self.feedback, self.times]
+        if sys.byteorder == 'big':
+            columns = [array(c.typecode, c) for c in columns]
+            for c in columns:
+                c.byteswap()
+
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, self.length, bytes.fromhex(self.fingerprint), len(self)))
+            f.write(struct.pack('<I', len(self.guesses)))
+            for c in columns:
+                f.write(c.tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'TraceLog':
+        with open(path, 'rb') as f:
+            magic, version, length, fingerprint, num_games = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f'{path} is not a wordpy trace log of version {FORMAT_VERSION}')
+            num_guesses, = struct.unpack('<I', f.read(4))
+
+            log = cls(fingerprint.hex(), length)
+            for column, size in [
+                (log.answers, num_games),
+                (log.counts, num_games),
+                (log.guesses, num_guesses),
+                (log.feedback, num_guesses),
+                (log.times, num_guesses),
+            ]:
+                column.frombytes(f.read(size * column.itemsize))
+                if len(column) != size:
+                    raise ValueError(f'{path} is truncated')
+                if sys.byteorder == 'big':
+                    column.byteswap()
+
+        for count in log.counts:
+            log.__offsets.append(log.__offsets[-1] + count)
+
+        return log
+
+
+class TraceRecorder:
+    """ Record games that played by Solver.solve into a TraceLog.
+    Pass it to `Solver.solve` as recorder.
+    """
+
+    def __init__(self, words: WordTable):
+        self.words = words
+        self.ids = {w: i for i, w in enumerate(words)}
+        self.log = TraceLog(cache.fingerprint(words), len(words[0]))
+
+        self.__guesses: list[int] = []
+        self.__feedback: list[int] = []
+        self.__times: list[float] = []
+
+    def record(self, word: str, state: GameState, elapsed: float) -> None:
+        """ Record a submitted word, using the state after submitting it. """
+
+        self.__guesses.append(self.ids[word])
+        self.__feedback.append(encode_feedback(''.join(
+            'g' if f == w else 'y' if w in state.includes else '.'
+            for w, f in zip(word, state.found)
+        )))
+        self.__times.append(elapsed)
+
+    def finish(self) -> None:
+        """ Finish the current game. The last submitted word is the answer. """
+
+        if len(self.__guesses) > 0:
+            self.log.append(GameTrace(
+                answer=self.__guesses[-1],
+                guesses=tuple(self.__guesses),
+                feedback=tuple(self.__feedback),
+                times=tuple(self.__times),
+            ))
+
+        self.__guesses = []
+        self.__feedback = []
+        self.__times = []
+
+
+def check_dictionary(log: TraceLog, words: WordTable) -> None:
+    if cache.fingerprint(words) != log.fingerprint:
+        raise ValueError('the trace log was recorded with another dictionary')
+
+
+def restore(trace: GameTrace, words: WordTable, num_guesses: int | None = None) -> FixedGame:
+    """ Make the game of the trace, and submit the recorded guesses without any solver. """
+
+    game = FixedGame(words, words[trace.answer])
+    for i in trace.guesses[:num_guesses]:
+        game.submit(words[i])
+    return game
+
+
+def replay(traces: TraceLog, words: WordTable, *solvers: Type[Solver], log=default_logger, recorder: TraceRecorder | None = None) -> list[tuple[str, float, float]]:
+    """ Play the games of the traces again by each solver, on exactly the same answers.
+    Returns results in the same format as `wordpy.benchmark`.
+    """
+
+    check_dictionary(traces, words)
+
+    results: list[tuple[str, float, float]] = []
+    for cls in solvers:
+        total = 0
+        win = 0
+        for answer in traces.answers:
+            state = cls(FixedGame(words, words[answer])).solve(log, recorder=recorder)
+            total += state.num_tried
+            if state.num_tried <= traces.length + 1:
+                win += 1
+        results.append((cls.__name__, total / len(traces), win / len(traces)))
+
+    return results
+
+
+def shrink(trace: GameTrace, words: WordTable, cls: Type[Solver], fails: Callable[[GameState], bool]) -> int:
+    """ Find the shortest prefix of the recorded guesses that still reproduces a failure.
+
+    The recorded guesses of the prefix are submitted as is, and the solver plays the rest of the game.
+    Returns the length of the prefix, or -1 if the solver never fails.
+    """
+
+    for n in range(len(trace.guesses)):
+        state = cls(restore(trace, words, n)).solve(lambda *_: None)
+        if fails(state):
+            return n
+    return -1
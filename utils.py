@@ -1,26 +1,31 @@
 from typing import Type
 import random
-import readline
 
-from .game import Game, FixedGame, TerminalGame
+from .game import Game, GameState, FixedGame, TerminalGame
 from .solver import Solver
+from .tracelog import TraceRecorder
 from .wordtable import WordTable
 
 
-def new_game(words: WordTable) -> Game:
-    return FixedGame(words, random.choice(words))
+def new_game(words: WordTable, rand: random.Random | None = None) -> Game:
+    return FixedGame(words, (rand or random).choice(words))
 
 
-def benchmark(words: WordTable, *solvers: Type[Solver], num_tries=100) -> list[tuple[str, float, float]]:
+def benchmark(words: WordTable, *solvers: Type[Solver], num_tries=100, seed: int | None = None, recorder: TraceRecorder | None = None) -> list[tuple[str, float, float]]:
+    """ Play games by each solver, and print average attempts and win rate.
+    If seed is given, every solver plays the same answers. If recorder is given, all games are recorded to it.
+    """
+
     results: list[tuple[str, float, float]] = []
 
     for cls in solvers:
+        rand = random.Random(seed) if seed is not None else None
         total = 0
         win = 0
         for i in range(num_tries):
             print(f'{cls.__name__} game {i}')
-            solver = cls(new_game(words))
-            result = solver.solve()
+            solver = cls(new_game(words, rand))
+            result = solver.solve(recorder=recorder)
             total += result.num_tried
             if result.num_tried <= len(words[0]) + 1:
                 win += 1
@@ -33,17 +38,31 @@ def benchmark(words: WordTable, *solvers: Type[Solver], num_tries=100) -> list[t
     return results
 
 
-def solve(words: WordTable, cls: Type[Solver]):
+def solve(words: WordTable, cls: Type[Solver], speculate: bool = True):
+    """ Solve a game interactively.
+    If speculate is True, the next guesses are computed in background while the user is typing the result.
+    """
+
+    import readline
+    from .speculation import Speculation
+
     game = TerminalGame(words)
     solver = cls(game)
+    guesses = solver.guess()
 
     history: list[GameState] = []
 
-    for i in range(6):
+    # the same number of attempts as benchmark and replay count as a win.
+    rounds = game.answer_length + 1
+
+    for i in range(rounds):
         print(f'candidates {i}:')
-        print(solver.guess())
+        print(guesses)
         print()
-        word = input('what did you input?\n  _____\n> ')
+        word = input(f'what did you input?\n  {"_" * game.answer_length}\n> ')
+
+        # no guess is needed after the last round.
+        speculation = Speculation(solver, word) if speculate and i < rounds - 1 else None
 
         ok = game.submit(word)
 
@@ -53,5 +72,14 @@ def solve(words: WordTable, cls: Type[Solver]):
             print(s.color_str())
         print()
 
-        if ok:
+        if ok or i == rounds - 1:
+            if speculation is not None:
+                speculation.cancel()
             break
+
+        result = speculation.take(game.state) if speculation is not None else None
+        if result is None:
+            guesses = solver.guess()
+        else:
+            solver, guesses = result
+            solver.game = game
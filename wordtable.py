@@ -1,5 +1,96 @@
-from typing import overload, Iterable, Iterator, Callable, Set
+from typing import overload, Iterable, Iterator, Callable, Sequence, Set, TypeVar
+from array import array
+from collections import deque
 import itertools
+import operator
+
+
+# translation tables between bytes of 0/1 and ASCII "0"/"1".
+TO_ASCII = bytes.maketrans(b'\x00\x01', b'01')
+FROM_ASCII = bytes.maketrans(b'01', b'\x00\x01')
+
+T = TypeVar('T')
+
+# bitmaps cost O(size of vocabulary), so they are used only if tables are at least 1/BITMAP_RATIO of the vocabulary.
+# smaller tables are compared by sets of ids.
+BITMAP_RATIO = 32
+
+
+def pick(seq: Sequence[T], ids: Sequence[int]) -> tuple[T, ...]:
+    """ Get items of seq at ids, faster than a generator for long ids.
+
+    >>> pick("abcd", [3, 0])
+    ('d', 'a')
+    """
+
+    if len(ids) == 0:
+        return ()
+    if len(ids) == 1:
+        return (seq[ids[0]], )
+    return operator.itemgetter(*ids)(seq)
+
+
+class Vocabulary:
+    """ A mapping of words to ids, shared by WordTables that derived from one dictionary.
+
+    WordTables of a vocabulary store the order of word ids instead of the words.
+    Set operators between them are done as bit operations if the tables are large, or by sets of ids if they are small compared with the vocabulary.
+    Tables of different vocabularies fall back to comparing words.
+
+    >>> vocabulary = Vocabulary(["hello", "world", "heart", "juice"])
+    >>> a = vocabulary.table()[:3]
+    >>> b = WordTable(["juice", "heart"], vocabulary)
+
+    >>> a | b
+    WordTable(['hello', 'world', 'heart', 'juice'])
+    >>> a ^ b
+    WordTable(['hello', 'world', 'juice'])
+    >>> (a - b).vocabulary is vocabulary
+    True
+
+    >>> large = Vocabulary(f"w{i:04d}" for i in range(1000)).table()
+    >>> large[:2] | large[1:3]
+    WordTable(['w0000', 'w0001', 'w0002'])
+    >>> (large[:3] - large[1:2]).vocabulary is large.vocabulary
+    True
+    """
+
+    def __init__(self, words: Iterable[str]):
+        self.words: list[str] = list(dict.fromkeys(words))
+        self.ids: dict[str, int] = {w: i for i, w in enumerate(self.words)}
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def table(self) -> 'WordTable':
+        """ Get a WordTable of all words in the vocabulary. """
+
+        return WordTable._from_ids(self, array('I', range(len(self.words))), (1 << len(self.words)) - 1)
+
+    def bitmap(self, ids: Iterable[int]) -> int:
+        """ Make a bitmap that the bit of each id is set.
+
+        >>> bin(Vocabulary("abcd").bitmap([0, 3]))
+        '0b1001'
+        """
+
+        flags = bytearray(len(self.words))
+        deque(map(flags.__setitem__, ids, itertools.repeat(1)), maxlen=0)
+        return int(flags[::-1].translate(TO_ASCII).decode('ascii') or '0', 2)
+
+    def flags(self, bits: int) -> bytes:
+        """ Expand a bitmap to one byte per id, for testing each id in constant time.
+
+        >>> Vocabulary("abcd").flags(0b1001)
+        b'\\x01\\x00\\x00\\x01'
+        """
+
+        return bin(bits)[:1:-1].ljust(len(self.words), '0').encode('ascii').translate(FROM_ASCII)
+
+    def select(self, ids: array, bits: int) -> array:
+        """ Take ids that included in the bitmap, keeping the order. """
+
+        return array('I', list(itertools.compress(ids, pick(self.flags(bits), ids))))
 
 
 class WordTable:
@@ -29,8 +120,72 @@ class WordTable:
     False
     """
 
-    def __init__(self, words: Iterable[str]):
-        self.__words = dict.fromkeys(words)
+    # set when the table is a subset of a vocabulary.
+    __vocabulary: Vocabulary | None = None
+    __order: array
+
+    # bitmap of ids in the table. this is made when needed first.
+    __bits: int | None
+
+    # set of ids in the table, for small tables. this is made when needed first.
+    __ids: frozenset[int] | None = None
+
+    __hash: int | None = None
+
+    def __init__(self, words: Iterable[str], vocabulary: Vocabulary | None = None):
+        if vocabulary is None:
+            self.__words = dict.fromkeys(words)
+            return
+
+        try:
+            ids = array('I', dict.fromkeys(map(vocabulary.ids.__getitem__, words)))
+        except KeyError as e:
+            raise ValueError(f'{e.args[0]!r} is not in the vocabulary') from None
+
+        self.__vocabulary = vocabulary
+        self.__order = ids
+        self.__bits = None
+
+    @staticmethod
+    def _from_ids(vocabulary: Vocabulary, order: array, bits: int | None = None) -> 'WordTable':
+        table = WordTable.__new__(WordTable)
+        table.__vocabulary = vocabulary
+        table.__order = order
+        table.__bits = bits
+        return table
+
+    def __bitmap(self) -> int:
+        if self.__bits is None:
+            self.__bits = self.__vocabulary.bitmap(self.__order)
+        return self.__bits
+
+    def __id_set(self) -> frozenset[int]:
+        if self.__ids is None:
+            self.__ids = frozenset(self.__order)
+        return self.__ids
+
+    def __prefers_bitmap(self, other: 'WordTable') -> bool:
+        return (len(self) + len(other)) * BITMAP_RATIO >= len(self.__vocabulary)
+
+    @property
+    def vocabulary(self) -> Vocabulary | None:
+        """ The vocabulary that this table derived from, or None. """
+
+        return self.__vocabulary
+
+    def __derive(self, words: Iterable[str]) -> 'WordTable':
+        """ Make a table of words that taken from this table, keeping the vocabulary. """
+
+        if self.__vocabulary is None:
+            return WordTable(words)
+        return WordTable._from_ids(self.__vocabulary, array('I', list(map(self.__vocabulary.ids.__getitem__, words))))
+
+    def __shares_vocabulary(self, other: object) -> bool:
+        return (
+            self.__vocabulary is not None
+            and isinstance(other, WordTable)
+            and other.__vocabulary is self.__vocabulary
+        )
 
     def take_matches(self, pattern: str, includes: Set[str] | str = None) -> 'WordTable':
         """ Take words that matches as the pattern.
@@ -55,7 +210,7 @@ class WordTable:
                 and (includes is None or all(i in word for i in includes))
             )
 
-        return WordTable(w for w in self if isMatch(w))
+        return self.__derive(w for w in self if isMatch(w))
 
     def drop_by_letters(self, letters: Iterable[str]) -> 'WordTable':
         """ Drop words that includes specified letters.
@@ -69,7 +224,7 @@ class WordTable:
         WordTable(['world']) 
         """
 
-        return WordTable(
+        return self.__derive(
             word
             for word in self
             if all(l not in word for l in letters)
@@ -89,7 +244,7 @@ class WordTable:
         WordTable(['hello'])
         """
 
-        return WordTable(
+        return self.__derive(
             word
             for word in self
             if all(p == '.' or w != p for w, p in zip(word, pattern))
@@ -99,22 +254,55 @@ class WordTable:
         return hash(self) == hash(other)
 
     def __hash__(self) -> int:
-        return hash(tuple(self.__words))
+        # WordTable is immutable, so the hash is computed only once.
+        if self.__hash is None:
+            self.__hash = hash(tuple(self))
+        return self.__hash
+
+    def __copy__(self) -> 'WordTable':
+        return self
+
+    def __deepcopy__(self, memo: dict) -> 'WordTable':
+        # WordTable is immutable, so copies can share the words.
+        return self
+
+    def __reduce__(self) -> tuple:
+        """ Pickle only the words, not the whole vocabulary.
+
+        >>> import pickle
+        >>> table = pickle.loads(pickle.dumps(Vocabulary(["hello", "world", "heart"]).table()[1:]))
+        >>> table, table.vocabulary
+        (WordTable(['world', 'heart']), None)
+        """
+
+        return (WordTable, (list(self), ))
 
     def __iter__(self) -> Iterator[str]:
+        if self.__vocabulary is not None:
+            return iter(pick(self.__vocabulary.words, self.__order))
         return iter(self.__words)
 
     def __len__(self) -> int:
+        if self.__vocabulary is not None:
+            return len(self.__order)
         return len(self.__words)
 
+    def __contains__(self, word: object) -> bool:
+        if self.__vocabulary is not None:
+            i = self.__vocabulary.ids.get(word)  # type: ignore
+            if i is None:
+                return False
+            return len(self.__order) == len(self.__vocabulary) or i in self.__id_set()
+        return word in self.__words
+
     def __eq__(self, other: 'WordTable') -> bool:
         return len(self) == len(other) and all(x == y for x, y in zip(self, other))
 
     def __repr__(self) -> str:
-        return 'WordTable(' + str(list(self.__words.keys())) + ')'
+        return 'WordTable(' + str(list(self)) + ')'
 
     def __str__(self) -> str:
-        return '\n'.join(self.__words)
+        return '\n'.join(self)
 
     @overload
     def __getitem__(self, idx: int) -> str:
@@ -125,6 +313,17 @@ class WordTable:
         ...
 
     def __getitem__(self, idx: int | slice) -> 'str | WordTable':
+        if self.__vocabulary is not None:
+            if isinstance(idx, int):
+                try:
+                    return self.__vocabulary.words[self.__order[idx]]
+                except IndexError:
+                    raise IndexError(f'out of index: {idx} of {len(self)}')
+            elif isinstance(idx, slice):
+                return WordTable._from_ids(self.__vocabulary, self.__order[idx])
+            else:
+                raise ValueError(f'invalid index: {idx}')
+
         if isinstance(idx, int):
             try:
                 idx = slice(idx, None).indices(len(self))[0]
@@ -151,6 +350,20 @@ class WordTable:
         WordTable(['hello', 'tasty', 'world', 'lemon'])
         """
 
+        if self.__shares_vocabulary(other) and not self.__prefers_bitmap(other):
+            ids = self.__id_set()
+            added = array('I', [i for i in other.__order if i not in ids])
+            if len(added) == 0:
+                return self
+            return WordTable._from_ids(self.__vocabulary, self.__order + added)
+
+        if self.__shares_vocabulary(other):
+            extra = other.__bitmap() & ~self.__bitmap()
+            if extra == 0:
+                return self
+            order = self.__order + self.__vocabulary.select(other.__order, extra)
+            return WordTable._from_ids(self.__vocabulary, order, self.__bitmap() | extra)
+
         return WordTable((*self, *other))
 
     def __ror__(self, other: Iterable[str]) -> 'WordTable':
@@ -171,7 +384,20 @@ class WordTable:
         WordTable(['hello', 'world'])
         """
 
-        return WordTable(w for w in self.__words if w in other)
+        if self.__shares_vocabulary(other) and not self.__prefers_bitmap(other):
+            ids = other.__id_set()
+            order = array('I', [i for i in self.__order if i in ids])
+            if len(order) == len(self):
+                return self
+            return WordTable._from_ids(self.__vocabulary, order)
+
+        if self.__shares_vocabulary(other):
+            bits = self.__bitmap() & other.__bitmap()
+            if bits == self.__bitmap():
+                return self
+            return WordTable._from_ids(self.__vocabulary, self.__vocabulary.select(self.__order, bits), bits)
+
+        return WordTable(w for w in self if w in other)
 
     def __rand__(self, other: Iterable[str]) -> 'WordTable':
         return self & other
@@ -189,7 +415,20 @@ class WordTable:
         WordTable(['tasty', 'world'])
         """
 
-        return WordTable(w for w in self.__words if w not in other)
+        if self.__shares_vocabulary(other) and not self.__prefers_bitmap(other):
+            ids = other.__id_set()
+            order = array('I', [i for i in self.__order if i not in ids])
+            if len(order) == len(self):
+                return self
+            return WordTable._from_ids(self.__vocabulary, order)
+
+        if self.__shares_vocabulary(other):
+            bits = self.__bitmap() & ~other.__bitmap()
+            if bits == self.__bitmap():
+                return self
+            return WordTable._from_ids(self.__vocabulary, self.__vocabulary.select(self.__order, bits), bits)
+
+        return WordTable(w for w in self if w not in other)
 
     def __rsub__(self, other: Iterable[str]) -> 'WordTable':
         return WordTable(other) - self
@@ -209,6 +448,20 @@ class WordTable:
         WordTable(['tasty', 'boxes'])
         """
 
+        if self.__shares_vocabulary(other) and not self.__prefers_bitmap(other):
+            mine = self.__id_set()
+            theirs = other.__id_set()
+            order = array('I', [i for i in self.__order if i not in theirs] + [i for i in other.__order if i not in mine])
+            return WordTable._from_ids(self.__vocabulary, order)
+
+        if self.__shares_vocabulary(other):
+            vocabulary = self.__vocabulary
+            order = (
+                vocabulary.select(self.__order, self.__bitmap() & ~other.__bitmap())
+                + vocabulary.select(other.__order, other.__bitmap() & ~self.__bitmap())
+            )
+            return WordTable._from_ids(vocabulary, order, self.__bitmap() ^ other.__bitmap())
+
         return WordTable((self - other) | (other - self))
 
     def __rxor__(self, other: Iterable[str]) -> 'WordTable':